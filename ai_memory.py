@@ -4,12 +4,62 @@ AI Memory System for Minecraft Companion Mod
 Handles short-term events, long-term learning, and conversation history.
 """
 
-import json
+import logging
+import mmap
 import os
+import shutil
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from enum import Enum
+from functools import lru_cache
+from itertools import islice
+from typing import List, Dict, Any, Optional, Set
+import orjson
 from openai import OpenAI
 
+logger = logging.getLogger(__name__)
+
+
+class SyncMode(Enum):
+    """How hard to push memory writes to disk"""
+    ALL = "all"    # os.fsync: data and file metadata
+    DATA = "data"  # os.fdatasync where available: data only
+    NONE = "none"  # leave flushing to the OS
+
+
+@dataclass
+class Event:
+    """A single game event kept in short-term memory"""
+    __slots__ = ("timestamp", "type", "data", "player")
+    timestamp: str
+    type: str
+    data: str
+    player: str
+    
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Event":
+        return cls(d.get("timestamp", ""), sys.intern(d.get("type", "")), d.get("data", ""),
+                   sys.intern(d.get("player", "Player")))
+
+
+@dataclass
+class AIResponse:
+    """A reply the AI gave, kept for conversation continuity"""
+    __slots__ = ("timestamp", "response", "context", "player")
+    timestamp: str
+    response: str
+    context: str
+    player: str
+    
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "AIResponse":
+        return cls(d.get("timestamp", ""), d.get("response", ""), d.get("context", ""),
+                   sys.intern(d.get("player", "Player")))
+
 
 class AIMemorySystem:
     """
@@ -18,6 +68,9 @@ class AIMemorySystem:
     - Long-term: AI-curated important facts and patterns
     """
     
+    SHORT_TERM_LIMIT = 50
+    CONVERSATION_LIMIT = 20
+    
     ASUKA_SYSTEM_PROMPT = """You are Asuka, a playful in-game companion inspired by Neon Genesis Evangelion.
 - Personality: cute anime tsundere girl — teasing, proud, playful, but secretly supportive.
 - Voice: short, witty remarks; mix of sass and encouragement. Vary your openings. NEVER start with "Hmph!"
@@ -26,26 +79,87 @@ class AIMemorySystem:
 - Never break the fourth wall or explain that you are an AI.
 """
     
-    def __init__(self, memory_file: str = "ai_memory.json", openai_client: Optional[OpenAI] = None):
+    def __init__(self, memory_file: str = "ai_memory.json", openai_client: Optional[OpenAI] = None,
+                 snapshot_interval: int = 50, sync_mode: SyncMode = SyncMode.DATA,
+                 sync_every_n_events: int = 10, write_behind: bool = False):
         """
         Initialize memory system
         
         Args:
-            memory_file: JSON file to store memory data
+            memory_file: JSON file to store memory snapshots
             openai_client: OpenAI client for memory consolidation
+            snapshot_interval: Rewrite the snapshot every N log entries
+            sync_mode: Disk sync strategy for snapshots and the log
+            sync_every_n_events: Sync the log to disk every N entries
+            write_behind: Leave log syncs and snapshots to flush_pending() instead
+                of doing them inline when memory is mutated
         """
         self.memory_file = memory_file
+        self.wal_file = memory_file + ".wal"
+        # Log segment set aside while a snapshot of it is being written
+        self.prev_wal_file = memory_file + ".prev.wal"
         self.openai_client = openai_client
+        self.snapshot_interval = snapshot_interval
+        self.sync_mode = sync_mode
+        self.sync_every_n_events = sync_every_n_events
+        self.write_behind = write_behind
+        self.dirty = False  # Log entries not yet synced by flush_pending()
+        self._wal = None  # Append handle, opened lazily
+        self._wal_entries = 0  # Entries written since the last snapshot
+        self._wal_seq = 0  # Sequence number of the newest log entry
+        # Consolidation runs on a worker thread, so guard buffers and the log handle
+        self._lock = threading.RLock()
+        # One snapshot at a time; always taken before _lock, never while holding it
+        self._snapshot_lock = threading.Lock()
+        self._ts_cache = (0, "")  # (epoch second, formatted timestamp)
+        self._events_since_consolidation = 0
+        
+        # Bumped on every mutation; used as cache keys for built contexts
+        self._short_term_version = 0
+        self._long_term_version = 0
+        self._conversation_version = 0
+        self._flat_long_term: List[str] = []
+        self._flat_long_term_version = -1
+        self._build_ai_context_cached = lru_cache(maxsize=64)(self._render_ai_context)
+        
         self.memory = self.load_memory()
         
+    @property
+    def version(self) -> int:
+        """Monotonic stamp that changes whenever memory is mutated"""
+        return self._short_term_version + self._long_term_version + self._conversation_version
+    
     def load_memory(self) -> Dict[str, Any]:
-        """Load memory from JSON file, create default structure if doesn't exist"""
+        """Load snapshot from JSON file and replay the write-ahead log on top of it"""
+        memory = self._load_snapshot()
+        
+        # Bounded buffers evict the oldest entry on append
+        memory["short_term"] = deque(map(Event.from_dict, memory["short_term"]),
+                                     maxlen=self.SHORT_TERM_LIMIT)
+        memory["conversation_history"] = deque(map(AIResponse.from_dict, memory["conversation_history"]),
+                                               maxlen=self.CONVERSATION_LIMIT)
+        # Last log entry the snapshot already includes
+        self._wal_seq = memory.pop("wal_seq", 0)
+        # A set-aside segment exists if we stopped mid-snapshot; its entries come first
+        self._wal_entries = self._replay_wal(memory, self.prev_wal_file) + self._replay_wal(memory, self.wal_file)
+        
+        # Persistent dedup index for long-term facts, kept in step with the lists
+        self._long_term_sets: Dict[str, Set[str]] = {
+            k: set(v) for k, v in memory["long_term"].items()
+        }
+        return memory
+    
+    def _load_snapshot(self) -> Dict[str, Any]:
+        """Load the last full snapshot, create default structure if doesn't exist"""
         if os.path.exists(self.memory_file):
             try:
-                with open(self.memory_file, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, FileNotFoundError):
-                print(f"Warning: Memory file {self.memory_file} corrupted, creating new one")
+                # Parse straight from the page cache instead of reading into a bytes copy
+                with open(self.memory_file, 'rb') as f, \
+                        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                        memoryview(mm) as view:
+                    return orjson.loads(view)
+            except (ValueError, FileNotFoundError):  # includes orjson.JSONDecodeError and empty files
+                logger.warning("Memory file %s corrupted, creating new one", self.memory_file)
         
         # Create default memory structure
         return {
@@ -65,17 +179,234 @@ class AIMemorySystem:
             }
         }
     
-    def save_memory(self) -> bool:
-        """Save memory to JSON file"""
+    def _replay_wal(self, memory: Dict[str, Any], path: str) -> int:
+        """
+        Apply write-ahead log entries written after the last snapshot
+        
+        Entries numbered at or below the snapshot's wal_seq are skipped, so a crash
+        between writing a snapshot and truncating the log doesn't apply them twice.
+        
+        Args:
+            memory: Memory structure to apply entries to
+            path: Log segment to replay
+            
+        Returns:
+            Number of entries replayed
+        """
+        if not os.path.exists(path):
+            return 0
+        
+        replayed = 0
+        offset = 0
+        torn_at = None
+        missing_newline = False
+        with open(path, 'rb') as f:
+            lines = f.read().splitlines(keepends=True)
+        
+        for i, line in enumerate(lines):
+            is_tail = i == len(lines) - 1
+            try:
+                entry = orjson.loads(line)
+                if not isinstance(entry, dict):
+                    raise ValueError("log entry is not an object")
+            except ValueError:  # includes orjson.JSONDecodeError
+                if is_tail:
+                    # A crash mid-append can leave a torn last line
+                    logger.warning("Dropping torn last entry of %s at byte %d", path, offset)
+                    torn_at = offset
+                    break
+                # Anything after it was written later and is still good
+                logger.warning("Skipping unreadable entry in %s at byte %d", path, offset)
+                offset += len(line)
+                continue
+            offset += len(line)
+            # Complete entry whose newline never made it to disk
+            missing_newline = is_tail and not line.endswith(b"\n")
+            
+            # Logs written before entries were numbered have no seq; apply them as-is
+            seq = entry.pop("seq", None)
+            if seq is not None:
+                if seq <= self._wal_seq:
+                    continue
+                self._wal_seq = seq
+            self._apply_entry(memory, entry)
+            replayed += 1
+        
+        # Leave the log ending on a clean line so new appends don't merge into the tail
+        if torn_at is not None:
+            os.truncate(path, torn_at)
+        elif missing_newline:
+            with open(path, 'ab') as f:
+                f.write(b"\n")
+        return replayed
+    
+    @staticmethod
+    def _apply_entry(memory: Dict[str, Any], entry: Dict[str, Any]) -> None:
+        """Apply a single log entry to the in-memory structure"""
+        kind = entry.pop("kind", None)
+        if kind == "event":
+            memory["short_term"].append(Event.from_dict(entry))
+            memory["stats"]["total_events"] += 1
+        elif kind == "response":
+            memory["conversation_history"].append(AIResponse.from_dict(entry))
+    
+    def _append_wal(self, kind: str, entry: Any) -> bool:
+        """
+        Append an entry to the write-ahead log
+        
+        Called with the lock held. Returns True when a snapshot is due; the caller
+        runs save_memory() after releasing the lock.
+        """
+        with self._lock:
+            try:
+                if self._wal is None:
+                    self._wal = open(self.wal_file, 'ab')
+                self._wal_seq += 1
+                self._wal.write(
+                    orjson.dumps({"kind": kind, "seq": self._wal_seq, **asdict(entry)}, default=str) + b"\n"
+                )
+                self._wal.flush()
+                self._wal_entries += 1
+                if self.write_behind:
+                    self.dirty = True
+                    return False
+                # Batch disk syncs instead of paying one per event
+                if self._wal_entries % self.sync_every_n_events == 0:
+                    self._sync(self._wal)
+            except Exception as e:
+                logger.error("Failed to append to memory log: %s", e)
+                return True
+            
+            return self._wal_entries >= self.snapshot_interval
+    
+    def flush_pending(self) -> None:
+        """
+        Sync log entries written since the last call, snapshotting once the log is long enough
+        
+        Used with write_behind, from a worker thread, so a burst of events costs one
+        disk sync instead of stalling the callers that appended them. The lock is only
+        held to look at the log; the sync itself runs on a duplicate file descriptor.
+        """
+        fd = None
+        with self._lock:
+            if not self.dirty:
+                return
+            self.dirty = False
+            snapshot_due = self._wal_entries >= self.snapshot_interval
+            if not snapshot_due and self._wal is not None and self.sync_mode is not SyncMode.NONE:
+                self._wal.flush()
+                fd = os.dup(self._wal.fileno())
+        
+        if snapshot_due:
+            self.save_memory()
+            return
+        if fd is None:
+            return
         try:
-            with open(self.memory_file, 'w') as f:
-                json.dump(self.memory, f, indent=2, default=str)
-            return True
+            self._sync_fd(fd)
         except Exception as e:
-            print(f"Failed to save memory: {e}")
-            return False
+            logger.error("Failed to sync memory log: %s", e)
+        finally:
+            os.close(fd)
     
-    def add_event(self, event_type: str, event_data: str, player: str = "Player") -> Dict[str, Any]:
+    def _serializable_memory(self) -> Dict[str, Any]:
+        """
+        Copy of memory with the bounded buffers converted to lists of dicts
+        
+        Everything mutable is copied, so the result can be encoded without the lock.
+        """
+        with self._lock:
+            return {
+                **self.memory,
+                "short_term": [asdict(e) for e in self.memory["short_term"]],
+                "long_term": {k: list(v) for k, v in self.memory["long_term"].items()},
+                "conversation_history": [asdict(r) for r in self.memory["conversation_history"]],
+                "stats": dict(self.memory["stats"]),
+                "wal_seq": self._wal_seq,
+            }
+    
+    def _sync(self, f) -> None:
+        """Flush a file to disk according to sync_mode"""
+        if self.sync_mode is SyncMode.NONE:
+            return
+        f.flush()
+        self._sync_fd(f.fileno())
+    
+    def _sync_fd(self, fd: int) -> None:
+        """Sync a file descriptor to disk according to sync_mode"""
+        if self.sync_mode is SyncMode.DATA and hasattr(os, "fdatasync"):
+            os.fdatasync(fd)
+        else:
+            os.fsync(fd)
+    
+    def _write_snapshot(self, path: str, data: Dict[str, Any]) -> None:
+        """Encode memory once and write it via a temp file, so readers never see a partial file"""
+        payload = orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+            # The log segment is deleted right after this, so the snapshot must hit disk first
+            self._sync(f)
+        os.replace(tmp_path, path)
+    
+    def _rotate_wal(self) -> None:
+        """Set the current log aside so new entries start a fresh segment"""
+        if self._wal is not None:
+            self._wal.close()
+            self._wal = None
+        self._wal_entries = 0
+        if not os.path.exists(self.wal_file):
+            return
+        if os.path.exists(self.prev_wal_file):
+            # An earlier snapshot failed; keep its entries ahead of these
+            with open(self.prev_wal_file, 'ab') as dst, open(self.wal_file, 'rb') as src:
+                shutil.copyfileobj(src, dst)
+            os.remove(self.wal_file)
+        else:
+            os.replace(self.wal_file, self.prev_wal_file)
+    
+    def save_memory(self) -> bool:
+        """
+        Save a full memory snapshot to JSON file and drop the log entries it covers
+        
+        Only copying memory and rotating the log happen under the lock, so callers
+        mutating memory never wait on the encode, write or disk sync.
+        Must not be called with the lock held.
+        """
+        with self._snapshot_lock:
+            with self._lock:
+                data = self._serializable_memory()
+                try:
+                    self._rotate_wal()
+                except Exception as e:
+                    logger.error("Failed to rotate memory log: %s", e)
+                    return False
+            
+            try:
+                self._write_snapshot(self.memory_file, data)
+            except Exception as e:
+                logger.error("Failed to save memory: %s", e)
+                return False
+            
+            # Everything in the set-aside segment is now part of the snapshot
+            try:
+                os.remove(self.prev_wal_file)
+            except FileNotFoundError:
+                pass
+            return True
+    
+    def _now_iso(self) -> str:
+        """Current local time as an ISO string, formatted at most once per second"""
+        t = time.time()
+        second = int(t)
+        cached_second, iso = self._ts_cache
+        if second == cached_second:
+            return iso
+        iso = datetime.fromtimestamp(t).isoformat(timespec="seconds")
+        self._ts_cache = (second, iso)
+        return iso
+    
+    def add_event(self, event_type: str, event_data: str, player: str = "Player") -> Event:
         """
         Add new event to short-term memory
         
@@ -85,24 +416,20 @@ class AIMemorySystem:
             player: Player name
             
         Returns:
-            The created event dictionary
+            The created event
         """
-        event = {
-            "timestamp": datetime.now().isoformat(),
-            "type": event_type,
-            "data": event_data,
-            "player": player
-        }
-        
-        # Add to short-term memory
-        self.memory["short_term"].append(event)
-        self.memory["stats"]["total_events"] += 1
-        
-        # Keep only last 50 events in short-term
-        if len(self.memory["short_term"]) > 50:
-            self.memory["short_term"] = self.memory["short_term"][-50:]
+        # Event types and player names repeat constantly; share one string object each
+        event = Event(self._now_iso(), sys.intern(event_type), event_data, sys.intern(player))
         
-        self.save_memory()
+        # Add to short-term memory (deque drops anything past the last 50)
+        with self._lock:
+            self.memory["short_term"].append(event)
+            self.memory["stats"]["total_events"] += 1
+            self._events_since_consolidation += 1
+            self._short_term_version += 1
+            snapshot_due = self._append_wal("event", event)
+        if snapshot_due:
+            self.save_memory()
         return event
     
     def add_ai_response(self, response: str, context: str = "", player: str = "Player") -> None:
@@ -114,38 +441,37 @@ class AIMemorySystem:
             context: Context that triggered the response
             player: Player name
         """
-        ai_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "response": response,
-            "context": context,
-            "player": player
-        }
+        ai_entry = AIResponse(self._now_iso(), response, context, sys.intern(player))
         
-        self.memory["conversation_history"].append(ai_entry)
-        
-        # Keep only last 20 responses
-        if len(self.memory["conversation_history"]) > 20:
-            self.memory["conversation_history"] = self.memory["conversation_history"][-20:]
-        
-        self.save_memory()
+        # Deque keeps only the last 20 responses
+        with self._lock:
+            self.memory["conversation_history"].append(ai_entry)
+            self._conversation_version += 1
+            snapshot_due = self._append_wal("response", ai_entry)
+        if snapshot_due:
+            self.save_memory()
     
-    def get_recent_events(self, count: int = 10, player: Optional[str] = None) -> List[Dict[str, Any]]:
+    def get_recent_events(self, count: int = 10, player: Optional[str] = None) -> List[Event]:
         """
         Get most recent events, optionally filtered by player
         
         Args:
-            count: Number of events to return
+            count: Number of events to return (0 or less for all of them)
             player: Filter by player name (None for all players)
             
         Returns:
             List of recent events
         """
-        events = self.memory["short_term"]
-        
-        if player:
-            events = [e for e in events if e.get("player") == player]
-        
-        return events[-count:] if events else []
+        # Walk backwards from the newest event so we stop after `count` matches
+        with self._lock:
+            events = reversed(self.memory["short_term"])
+            
+            if player:
+                events = (e for e in events if e.player == player)
+            
+            recent = list(islice(events, count if count > 0 else None))
+        recent.reverse()
+        return recent
     
     def get_relevant_long_term_facts(self, max_facts: int = 10) -> List[str]:
         """
@@ -157,11 +483,15 @@ class AIMemorySystem:
         Returns:
             List of long-term facts
         """
-        facts = []
-        for category, items in self.memory["long_term"].items():
-            facts.extend(items)
+        # Re-flatten only when consolidation or clearing changed long-term memory
+        if self._flat_long_term_version != self._long_term_version:
+            with self._lock:
+                self._flat_long_term = [
+                    fact for items in self.memory["long_term"].values() for fact in items
+                ]
+                self._flat_long_term_version = self._long_term_version
         
-        return facts[:max_facts]
+        return self._flat_long_term[:max_facts]
     
     def build_ai_context(self, player: str = "Player", recent_count: int = 5) -> str:
         """
@@ -174,31 +504,41 @@ class AIMemorySystem:
         Returns:
             Formatted context string
         """
-        context_parts = []
+        return self._build_ai_context_cached(
+            player, recent_count,
+            self._short_term_version, self._long_term_version, self._conversation_version
+        )
+    
+    def _render_ai_context(self, player: str, recent_count: int, short_term_version: int,
+                           long_term_version: int, conversation_version: int) -> str:
+        """Build the context string; the version arguments only serve as cache keys"""
+        sections = []
         
         # Add recent events for this player
         recent_events = self.get_recent_events(recent_count, player)
         if recent_events:
-            context_parts.append("Recent events:")
-            for event in recent_events:
-                context_parts.append(f"- {event['type']}: {event['data']}")
+            sections.append("Recent events:\n" + "\n".join(
+                f"- {event.type}: {event.data}" for event in recent_events
+            ))
         
         # Add long-term facts
         long_term_facts = self.get_relevant_long_term_facts()
         if long_term_facts:
-            context_parts.append(f"\nWhat I know about {player}:")
-            for fact in long_term_facts:
-                context_parts.append(f"- {fact}")
+            sections.append(f"\nWhat I know about {player}:\n" + "\n".join(
+                f"- {fact}" for fact in long_term_facts
+            ))
         
-        # Add recent conversation with this player
-        recent_responses = [r for r in self.memory["conversation_history"][-5:] 
-                          if r.get("player") == player]
-        if recent_responses:
-            context_parts.append("\nRecent conversation:")
-            for response in recent_responses:
-                context_parts.append(f"- I said: {response['response'][:60]}...")
+        # Add recent conversation with this player (only the last 5 responses are scanned)
+        with self._lock:
+            last_responses = list(islice(reversed(self.memory["conversation_history"]), 5))
+        last_responses.reverse()
+        said = "\n".join(
+            f"- I said: {r.response[:60]}..." for r in last_responses if r.player == player
+        )
+        if said:
+            sections.append("\nRecent conversation:\n" + said)
         
-        return "\n".join(context_parts)
+        return "\n".join(sections)
     
     def should_consolidate(self, event_interval: int = 15) -> bool:
         """
@@ -210,41 +550,43 @@ class AIMemorySystem:
         Returns:
             True if consolidation should run
         """
-        total_events = self.memory["stats"]["total_events"]
-        return total_events > 0 and total_events % event_interval == 0
+        return self._events_since_consolidation >= event_interval
+    
+    def reset_consolidation_counter(self) -> None:
+        """Start counting towards the next consolidation; call when one is scheduled"""
+        self._events_since_consolidation = 0
     
     def consolidate_memories_with_ai(self, event_count: int = 15) -> bool:
         """
         Use AI to extract important facts from recent events and merge into long-term memory.
         """
         if not self.openai_client:
-            print("Warning: No OpenAI client provided, cannot consolidate memories")
+            logger.warning("No OpenAI client provided, cannot consolidate memories")
             return False
 
         recent_events = self.get_recent_events(event_count)
         if not recent_events:
-            print("No recent events to consolidate.")
+            logger.info("No recent events to consolidate.")
             return False
 
         # 1) Build compact event text
         events_text = "\n".join(
-            f"{e['timestamp']}: {e['type']} - {e['data']}" for e in recent_events
+            f"{e.timestamp}: {e.type} - {e.data}" for e in recent_events
         )
 
         # 2) Ask for STRICT JSON
         system = (
             "You extract durable gameplay insights from recent Minecraft events. "
-            "Return ONLY valid JSON with these keys:\n"
-            '{"preferences":[],"projects":[],"personality":[],"achievements":[]}\n'
-            "No extra text."
+            "Output JSON with these keys:\n"
+            '{"preferences":[],"projects":[],"personality":[],"achievements":[]}'
         )
         user = (
-            "Analyze these events and return only JSON with significant long-term insights. "
+            "Analyze these events and list significant long-term insights. "
             "Prefer concise, de-duplicated phrases.\n\n" + events_text
         )
 
         try:
-            # Prefer JSON mode if your SDK supports it
+            # JSON mode constrains decoding to a valid JSON object
             response = self.openai_client.chat.completions.create(
                 model="gpt-4o-mini",
                 temperature=0.2,
@@ -252,8 +594,7 @@ class AIMemorySystem:
                     {"role": "system", "content": system},
                     {"role": "user", "content": user},
                 ],
-                # If your SDK supports JSON response format, uncomment this:
-                # response_format={"type": "json_object"},
+                response_format={"type": "json_object"},
             )
             raw = response.choices[0].message.content
 
@@ -261,12 +602,13 @@ class AIMemorySystem:
             def _coerce_json(s: str):
                 s = s.strip()
                 if s.startswith("```"):
-                    # remove ```json ... ``` fences if any
-                    s = s.strip("`")
-                    # after stripping backticks, there may be 'json\n' prefix
-                    if s.lower().startswith("json"):
-                        s = s.split("\n", 1)[1] if "\n" in s else ""
-                return json.loads(s)
+                    # remove ```json ... ``` fences by slicing; orjson skips the whitespace
+                    s = s[3:]
+                    if s.endswith("```"):
+                        s = s[:-3]
+                    if s[:4].lower() == "json":
+                        s = s[4:]
+                return orjson.loads(s)
 
             ai_insights = _coerce_json(raw)
 
@@ -278,36 +620,44 @@ class AIMemorySystem:
                 "achievements": "achievements",
             }
 
-            insights_added = 0
-            for k_model, lst in ai_insights.items():
-                k_mem = key_map.get(k_model)
-                if not k_mem or not isinstance(lst, list):
-                    continue
+            def _to_fact(item) -> str:
+                if isinstance(item, str):
+                    return item
+                try:
+                    return orjson.dumps(item).decode()
+                except Exception:
+                    return str(item)
+
+            # Merge under the lock; the request path keeps mutating memory meanwhile
+            with self._lock:
+                long_term = self.memory["long_term"]
+                insights_added = 0
+                for k_model, lst in ai_insights.items():
+                    k_mem = key_map.get(k_model)
+                    if not k_mem or not isinstance(lst, list):
+                        continue
 
-                # ensure the list exists
-                self.memory["long_term"].setdefault(k_mem, [])
-                existing = set(self.memory["long_term"][k_mem])
+                    # ensure the list and its dedup set exist
+                    facts = long_term.setdefault(k_mem, [])
+                    existing = self._long_term_sets.setdefault(k_mem, set())
 
-                # normalize to strings and avoid dupes
-                for item in lst:
-                    if not isinstance(item, str):
-                        try:
-                            item = json.dumps(item, ensure_ascii=False)
-                        except Exception:
-                            item = str(item)
-                    if item not in existing:
-                        self.memory["long_term"][k_mem].append(item)
-                        existing.add(item)
-                        insights_added += 1
+                    # normalize to strings and avoid dupes
+                    for item in map(_to_fact, lst):
+                        if item not in existing:
+                            facts.append(item)
+                            existing.add(item)
+                            insights_added += 1
 
-            self.memory["last_consolidation"] = datetime.now().isoformat()
-            self.memory["stats"]["consolidations_run"] += 1
+                # Bumped even when nothing new was learned: the stats changed
+                self._long_term_version += 1
+                self.memory["last_consolidation"] = self._now_iso()
+                self.memory["stats"]["consolidations_run"] += 1
             self.save_memory()
-            print(f"✨ Memory consolidated: Added {insights_added} new insights")
+            logger.info("✨ Memory consolidated: Added %d new insights", insights_added)
             return True
 
         except Exception as e:
-            print(f"Memory consolidation failed: {e}")
+            logger.error("Memory consolidation failed: %s", e)
             return False
 
     # Non-essential methods for stats, clearing, exporting
@@ -339,22 +689,28 @@ class AIMemorySystem:
         Args:
             keep_long_term: If True, only clear short-term and conversation history
         """
-        self.memory["short_term"] = []
-        self.memory["conversation_history"] = []
+        with self._lock:
+            self.memory["short_term"].clear()
+            self.memory["conversation_history"].clear()
         
-        if not keep_long_term:
-            self.memory["long_term"] = {
-                "player_preferences": [],
-                "building_projects": [],
-                "personality_notes": [],
-                "achievements": []
-            }
-            self.memory["last_consolidation"] = None
-            self.memory["stats"]["consolidations_run"] = 0
+            if not keep_long_term:
+                self.memory["long_term"] = {
+                    "player_preferences": [],
+                    "building_projects": [],
+                    "personality_notes": [],
+                    "achievements": []
+                }
+                self._long_term_sets = {k: set() for k in self.memory["long_term"]}
+                self.memory["last_consolidation"] = None
+                self.memory["stats"]["consolidations_run"] = 0
         
-        self.memory["stats"]["total_events"] = 0
+            self.memory["stats"]["total_events"] = 0
+            self._events_since_consolidation = 0
+            self._short_term_version += 1
+            self._long_term_version += 1
+            self._conversation_version += 1
         self.save_memory()
-        print(f"Memory cleared (long-term preserved: {keep_long_term})")
+        logger.info("Memory cleared (long-term preserved: %s)", keep_long_term)
     
     def export_memory(self, export_file: str) -> bool:
         """
@@ -367,18 +723,18 @@ class AIMemorySystem:
             True if successful
         """
         try:
-            with open(export_file, 'w') as f:
-                json.dump(self.memory, f, indent=2, default=str)
-            print(f"Memory exported to {export_file}")
+            self._write_snapshot(export_file, self._serializable_memory())
+            logger.info("Memory exported to %s", export_file)
             return True
         except Exception as e:
-            print(f"Failed to export memory: {e}")
+            logger.error("Failed to export memory: %s", e)
             return False
 
 
 # Example usage and testing
 if __name__ == "__main__":
     # Test the memory system
+    logging.basicConfig(level=logging.INFO)
     print("Testing AI Memory System...")
     
     memory = AIMemorySystem("test_memory.json")
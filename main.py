@@ -1,22 +1,56 @@
 # main.py - Updated FastAPI server using dedicated memory class
-import json
+import asyncio
+import atexit
+import logging
+import logging.handlers
 import os
+import queue
 import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
-from fastapi import FastAPI, Request
+from fastapi import BackgroundTasks, FastAPI, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, Dict
-from openai import OpenAI
+from typing import Any, AsyncIterator, Callable, Optional, Dict
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, OpenAI
 from elevenlabs.client import ElevenLabs
 from elevenlabs import play
 from io import BytesIO
+import orjson
 
 # Import our dedicated memory system
 from ai_memory import AIMemorySystem
 
 load_dotenv()  # Load environment variables from .env file
 
-openai_client = OpenAI()
+# Handlers only enqueue records; a listener thread does the actual stdout writes,
+# so logging never blocks the event loop. LOG_LEVEL=DEBUG shows every event.
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler())
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    handlers=[logging.handlers.QueueHandler(_log_queue)],
+)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+logging.getLogger("httpx").setLevel(logging.WARNING)  # one line per OpenAI request otherwise
+logger = logging.getLogger("companion")
+
+# One shared, warm HTTP/2 connection pool for every OpenAI call; sized well above
+# the /event concurrency cap plus in-flight rating batches
+openai_client = AsyncOpenAI(
+    http_client=DefaultAsyncHttpxClient(
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        http2=True,
+        timeout=30.0,
+    ),
+    max_retries=2,
+)
 elevenlabs = ElevenLabs(
   api_key=os.getenv("ELEVENLABS_API_KEY"),
 )
@@ -28,8 +62,27 @@ elevenlabs = ElevenLabs(
 #     files=[BytesIO(open("/path/to/your/audio/file.mp3", "rb").read())]
 # )
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create loop-bound state and run the background workers for the server's lifetime"""
+    global _event_batch_queue, _consolidation_lock, _event_slots
+    _event_batch_queue = asyncio.Queue()
+    _consolidation_lock = asyncio.Lock()
+    _event_slots = asyncio.Semaphore(MAX_INFLIGHT_EVENTS)
+    # asyncio.to_thread work (consolidation) shares a small, bounded pool
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=4, thread_name_prefix="companion")
+    )
+    batch_worker = asyncio.create_task(event_batch_worker())
+    flush_worker = asyncio.create_task(memory_flush_worker())
+    yield
+    batch_worker.cancel()
+    flush_worker.cancel()
+    await asyncio.to_thread(memory_system.flush_pending)
+    await openai_client.close()
+
 # Initialize FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 class Event(BaseModel):
     type: str
@@ -39,45 +92,200 @@ class Event(BaseModel):
     details: Optional[Dict] = None
 
 # Initialize memory system with OpenAI client for consolidation
+# (consolidation runs in a worker thread, so it keeps a sync client)
+# Disk syncs and snapshots are left to memory_flush_worker, off the request path
 memory_system = AIMemorySystem(
     memory_file="data/minecraft_ai_memory.json",
-    openai_client=openai_client
+    openai_client=OpenAI(),
+    write_behind=True
 )
+_consolidation_lock: Optional[asyncio.Lock] = None  # created by lifespan; one run at a time
+
+MEMORY_FLUSH_INTERVAL = 0.5  # seconds between write-behind flushes
+
+async def memory_flush_worker():
+    """Periodically sync new memory log entries to disk in a worker thread"""
+    while True:
+        await asyncio.sleep(MEMORY_FLUSH_INTERVAL)
+        if memory_system.dirty:
+            try:
+                await asyncio.to_thread(memory_system.flush_pending)
+            except Exception as e:
+                logger.error("Memory flush failed: %s", e)
+
+async def consolidate_in_background():
+    """Consolidate after the response is sent; skip if a run is already in progress"""
+    if _consolidation_lock.locked():
+        return
+    async with _consolidation_lock:
+        await asyncio.to_thread(memory_system.consolidate_memories_with_ai)
+
+# Static request parameters shared by every companion call
+BASE_CHAT_KWARGS = {"model": "gpt-4o-mini", "temperature": 0.6, "max_tokens": 100}
+GAME_EVENT_KWARGS = {**BASE_CHAT_KWARGS, "temperature": 0.7, "max_tokens": 120}
+
+# System prompts are built once so the prefix sent to OpenAI is byte-identical
+# across calls and can hit its automatic prompt cache. The persona always
+# comes first and is never interpolated; per-call context goes in the user turn.
+ASUKA_MESSAGE = {"role": "system", "content": AIMemorySystem.ASUKA_SYSTEM_PROMPT}
+
+CHAT_SYSTEM_MESSAGE = "Keep responses under 50 words and stay in character."
+CHAT_RULES_MESSAGE = {"role": "system", "content": CHAT_SYSTEM_MESSAGE}
+
+GAME_EVENT_RUBRIC = """As Asuka, evaluate each numbered Minecraft event the user sends, using the context given with it.
+
+Scoring rules:
+- ALWAYS rate 1-10 based on excitement/rarity.
+- Common events (breaking dirt, walking, basic crafting) get low scores (1-3).
+- Uncommon events (finding coal, crafting tools, basic combat) get medium scores (4-6).
+- ALWAYS rate consequative common events lower (e.g. multiple dirt breaks) UNLESS:
+- Milestone boost: increase rating at 10th/25th occurrence or when a streak is unusually fast.
+- Rarity boost: diamonds/ancient debris/unique loot get higher ratings; common blocks stay low unless milestone.
+- Diversity: if responding to a similar event, vary tone/wording from your last 3 replies.
+- If rating < 9 → "response": "no response".
+- If rating ≥ 9 → keep response < 30 words, in character, and briefly acknowledge the pattern when relevant.
+
+Output JSON, one ratings entry per event in the order given:
+{
+  "ratings": [
+    {
+      "rating": <1-10>,
+      "response": "<string or 'no response'>",
+      "pattern": "<optional 1-line pattern insight>"
+    }
+  ]
+}
+"""
+GAME_EVENT_RUBRIC_MESSAGE = {"role": "system", "content": GAME_EVENT_RUBRIC}
+
+# Game events arriving within a short window are rated together in one call
+EVENT_BATCH_SIZE = 8
+EVENT_BATCH_WINDOW = 0.15  # seconds to wait for more events after the first
+# A verdict is stale after a few seconds, so rating calls give up sooner than chat.
+# Same connection pool, tighter budget: at most two 10 s attempts.
+RATING_REQUEST_TIMEOUT = 10.0
+RATING_MAX_RETRIES = 1
+rating_client = openai_client.with_options(timeout=RATING_REQUEST_TIMEOUT, max_retries=RATING_MAX_RETRIES)
+# How long an event waits for its verdict: the batch window, every attempt, plus
+# headroom for the SDK's retry backoff (well under a few seconds for one retry)
+EVENT_RATING_TIMEOUT = EVENT_BATCH_WINDOW + RATING_REQUEST_TIMEOUT * (RATING_MAX_RETRIES + 1) + 5.0
+_event_batch_queue: Optional[asyncio.Queue] = None  # created by lifespan
+
+# Verdict cache for repeat game events: (type, subject, streak) keys whose last
+# rating produced no reply. Only silent verdicts are cached so spoken lines never repeat.
+EVENT_CACHE_SIZE = 256
+RARE_EVENT_KEYWORDS = ("ancient_debris", "diamond", "wither")
+MILESTONE_STREAKS = (10, 25)
+_event_verdict_cache: "OrderedDict[tuple, int]" = OrderedDict()
+_event_streaks: Dict[tuple, tuple] = {}  # (player, type) -> (subject, consecutive count)
+_inflight_ratings: set = set()  # (player, type, subject) currently awaiting a verdict
+
+# Events that are never worth a remark once the first few have been rated
+BORING_TYPES = frozenset({"player_move", "walk", "jump", "sprint", "swim"})
+BORING_BLOCKS = frozenset({"dirt", "grass", "grass_block", "stone", "cobblestone", "sand", "gravel", "netherrack"})
+BORING_ITEMS = frozenset({"stick", "oak_planks", "spruce_planks", "birch_planks", "torch", "crafting_table"})
+BORING_GRACE = 3  # consecutive repeats still sent to the model
+
+# Payload keys shown in the stored event text, with the label each is shown under
+EVENT_FIELDS = (
+    ("entity", "entity"),
+    ("pos", "position"),
+    ("details", "details"),
+    ("block", "details"),
+    ("item", "details"),
+)
+
+def event_subject(data: dict) -> str:
+    """What the event is about, without the position (which changes every time)"""
+    return ", ".join(
+        str(data[k]) for k in ("entity", "details", "block", "item") if data.get(k)
+    ).lower()
+
+def advance_streak(player: str, event_type: str, subject: str) -> int:
+    """
+    Count how many times in a row this player produced the same subject for this event type
+    
+    Streaks are tracked per event type, so moving between block breaks neither
+    resets the dirt streak nor merges it with placing dirt.
+    """
+    key = (player, event_type)
+    last_subject, count = _event_streaks.get(key, (None, 0))
+    count = count + 1 if subject == last_subject else 1
+    _event_streaks[key] = (subject, count)
+    return count
+
+def _base_id(value) -> Optional[str]:
+    """Lower-cased id without namespace, so "minecraft:dirt" matches "dirt"; None for non-strings"""
+    return value.lower().rpartition(":")[2] if isinstance(value, str) else None
+
+def is_boring_event(event_type: str, data: dict) -> bool:
+    """True for movement, common-block and basic-crafting events"""
+    if event_type in BORING_TYPES:
+        return True
+    return _base_id(data.get("block")) in BORING_BLOCKS or _base_id(data.get("item")) in BORING_ITEMS
+
+def event_cache_key(event_type: str, subject: str, count: int) -> Optional[tuple]:
+    """
+    Build the verdict-cache key for a game event
+    
+    Returns:
+        Cache key, or None when the event must always reach the model
+    """
+    if count in MILESTONE_STREAKS:
+        return None
+    if any(word in subject or word in event_type.lower() for word in RARE_EVENT_KEYWORDS):
+        return None
+    return (event_type, subject, min(count, 5))
+
+def remember_silent_verdict(key: tuple, rating: int) -> None:
+    """Cache a verdict that produced no reply, evicting the oldest entry when full"""
+    _event_verdict_cache[key] = rating
+    _event_verdict_cache.move_to_end(key)
+    if len(_event_verdict_cache) > EVENT_CACHE_SIZE:
+        _event_verdict_cache.popitem(last=False)
+
+# Strong references to fire-and-forget tasks so they aren't garbage collected
+_background_tasks = set()
+
+def run_in_background(coro) -> None:
+    """Schedule a coroutine on the running loop without awaiting it"""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
 
 @app.get("/")
 def root():
     return {"ok": True, "msg": "server up", "memory_stats": memory_system.get_memory_stats()}
 
-def handle_chat(data: dict) -> str:
-    """Handle player chat with AI companion"""
-    player = data.get("player", "Player")
-    text = data.get("text", "")
-    
+CHAT_FALLBACK_REPLY = "Hmm, I'm having trouble thinking right now..."
+
+def prepare_chat_messages(player: str, text: str) -> list:
+    """Record the chat line in memory and build the messages for the reply"""
     # Add chat event to memory
     memory_system.add_event("player_chat", f'said: "{text}"', player)
     
     # Build context from memory
     context = memory_system.build_ai_context(player)
     
-    # Enhanced system message with context
-    system_message = f"""{memory_system.ASUKA_SYSTEM_PROMPT}
-    Keep responses under 50 words and stay in character."""
-    
-    messages = [
-        {"role": "system", "content": system_message},
-        {"role": "user", "content": f"Context:\n{context}\n\n{player} says: \"{text}\". Respond appropriately."}
+    # Cacheable static prefix, then the volatile memory context, then the user turn
+    return [
+        ASUKA_MESSAGE,
+        CHAT_RULES_MESSAGE,
+        {"role": "system", "content": f"Context:\n{context}"},
+        {"role": "user", "content": f"{player} says: \"{text}\". Respond appropriately."}
     ]
 
+async def handle_chat(data: dict) -> str:
+    """Handle player chat with AI companion"""
+    player = data.get("player", "Player")
+    text = data.get("text", "")
+    messages = prepare_chat_messages(player, text)
+
     try:
-        resp = openai_client.chat.completions.create(
-            model="gpt-4o-mini",
-            temperature=0.6,
-            messages=messages,
-            max_tokens=100
-        )
+        resp = await openai_client.chat.completions.create(messages=messages, **BASE_CHAT_KWARGS)
         
         reply = resp.choices[0].message.content.strip()
-        print("<<< OpenAI chat reply:", reply, flush=True)
+        logger.info("<<< OpenAI chat reply: %s", reply)
         
         # Store AI response in memory
         memory_system.add_ai_response(reply, f'chat: "{text}"', player)
@@ -86,128 +294,251 @@ def handle_chat(data: dict) -> str:
         return reply
         
     except Exception as e:
-        print(f"Chat error: {e}")
-        return "Hmm, I'm having trouble thinking right now..."
+        logger.error("Chat error: %s", e)
+        return CHAT_FALLBACK_REPLY
+
+async def open_chat_stream(data: dict) -> AsyncIterator[str]:
+    """
+    Start a streamed chat reply
+    
+    Waits only until the model starts answering; the returned iterator yields
+    server-sent events with each token, then a final "done" event with the full reply.
+    """
+    player = data.get("player", "Player")
+    text = data.get("text", "")
+    messages = prepare_chat_messages(player, text)
+    
+    try:
+        completion = await openai_client.chat.completions.create(
+            messages=messages, stream=True, **BASE_CHAT_KWARGS
+        )
+    except Exception as e:
+        logger.error("Chat error: %s", e)
+        completion = None
+    return chat_event_stream(completion, player, text)
 
-def handle_game_event(data: dict) -> str:
+async def chat_event_stream(completion, player: str, text: str) -> AsyncIterator[str]:
+    """Relay completion tokens as server-sent events, then store and speak the full reply"""
+    parts = []
+    if completion is not None:
+        try:
+            async for chunk in completion:
+                token = chunk.choices[0].delta.content if chunk.choices else None
+                if token:
+                    parts.append(token)
+                    yield f"data: {orjson.dumps(token).decode()}\n\n"
+        except Exception as e:
+            logger.error("Chat stream error: %s", e)
+    
+    reply = "".join(parts).strip()
+    if reply:
+        logger.info("<<< OpenAI chat reply: %s", reply)
+        memory_system.add_ai_response(reply, f'chat: "{text}"', player)
+        handle_ai_chat_tts(reply, player)
+    else:
+        reply = CHAT_FALLBACK_REPLY
+    yield f"event: done\ndata: {orjson.dumps({'reply': reply}).decode()}\n\n"
+
+async def handle_game_event(data: dict) -> str:
     """Handle non-chat game events with AI response"""
     event_type = data.get("type", "unknown")
     player = data.get("player", "Player")
     
     # Format event data
-    event_details = []
-    if data.get("entity"):
-        event_details.append(f"entity: {data['entity']}")
-    if data.get("pos"):
-        event_details.append(f"position: {data['pos']}")
-    if data.get("details"):
-        event_details.append(f"details: {data['details']}")
-    if data.get("block"):
-        event_details.append(f"details: {data['block']}")
-    if data.get("item"):
-        event_details.append(f"details: {data['item']}")
-    
-    event_data = ", ".join(event_details) if event_details else "no details"
+    event_data = ", ".join(
+        f"{label}: {data[k]}" for k, label in EVENT_FIELDS if data.get(k)
+    ) or "no details"
     
     # Add to memory
     memory_system.add_event(event_type, event_data, player)
     
+    subject = event_subject(data)
+    streak = advance_streak(player, event_type, subject)
+    
+    # Dull events skip the model after the first few, except at milestones
+    if is_boring_event(event_type, data) and streak > BORING_GRACE and streak not in MILESTONE_STREAKS:
+        return ""
+    
+    # Repeat of an event the model already judged not worth a reply
+    cache_key = event_cache_key(event_type, subject, streak)
+    if cache_key is not None and cache_key in _event_verdict_cache:
+        _event_verdict_cache.move_to_end(cache_key)
+        return ""
+    
+    # The same event from this player is already being rated; that verdict answers
+    # for both, so don't spend another model call (rare and milestone events excepted)
+    inflight_key = (player, event_type, subject)
+    if cache_key is not None and inflight_key in _inflight_ratings:
+        return ""
+    
     # Build context
     context = memory_system.build_ai_context(player)
-    
-    # Create AI prompt for game events
-    prompt = f"""{memory_system.ASUKA_SYSTEM_PROMPT}\n {context}
-As Asuka, evaluate this Minecraft event: {event_type} - {event_data}
-
-Scoring rules:
-- ALWAYS rate 1-10 based on excitement/rarity.
-- Common events (breaking dirt, walking, basic crafting) get low scores (1-3).
-- Uncommon events (finding coal, crafting tools, basic combat) get medium scores (4-6).
-- ALWAYS rate consequative common events lower (e.g. multiple dirt breaks) UNLESS:
-- Milestone boost: increase rating at 10th/25th occurrence or when a streak is unusually fast.
-- Rarity boost: diamonds/ancient debris/unique loot get higher ratings; common blocks stay low unless milestone.
-- Diversity: if responding to a similar event, vary tone/wording from your last 3 replies.
-- If rating < 9 → "response": "no response".
-- If rating ≥ 9 → keep response < 30 words, in character, and briefly acknowledge the pattern when relevant.
-
-Return ONLY JSON in this format:
-{{
-  "rating": <1-10>,
-  "response": "<string or 'no response'>",
-  "pattern": "<optional 1-line pattern insight>"
-}}
-
-"""
-    messages = [
-        {"role": "system", "content": prompt}
-    ]
 
     try:
-        resp = openai_client.chat.completions.create(
-            model="gpt-4o-mini",
-            temperature=0.7,
-            messages=messages,
-            max_tokens=120
-        )
-
-        raw = resp.choices[0].message.content.strip()
+        _inflight_ratings.add(inflight_key)
+        try:
+            verdict = await rate_game_event(context, event_type, event_data)
+        finally:
+            _inflight_ratings.discard(inflight_key)
 
         try:
-            data = json.loads(raw)
-            rating = int(data.get("rating", 0))
-            reply = data.get("response", "").strip()
-            pattern = data.get("pattern", "").strip()
+            rating = int(verdict["rating"])
+            reply = str(verdict.get("response") or "").strip()
+            pattern = str(verdict.get("pattern") or "").strip()
         except Exception:
-            rating, reply = 0, ""
+            return ""  # missing or malformed verdict → no reply, and nothing to cache
 
         if rating >= 4 and reply.lower() != "no response":
-            print(f"🎮 Game event response: {reply}")
+            logger.info("🎮 Game event response: %s", reply)
             memory_system.add_ai_response(f"Reply:{reply} Patterns: {pattern}", f"{event_type}: {event_data}", player)
             handle_ai_chat_tts(reply, player)
             return reply
 
+        if cache_key is not None:
+            remember_silent_verdict(cache_key, rating)
         return ""  # boring event → no reply
 
         
     except Exception as e:
-        print(f"Game event error: {e}")
+        logger.error("Game event error: %s", e)
         return ""
+
+async def rate_game_event(context: str, event_type: str, event_data: str) -> dict:
+    """Queue an event for the next batched rating call and wait for its verdict"""
+    future = asyncio.get_running_loop().create_future()
+    await _event_batch_queue.put((context, event_type, event_data, future))
+    try:
+        return await asyncio.wait_for(future, EVENT_RATING_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning("Rating timed out for %s event", event_type)
+        return {}
+
+async def event_batch_worker():
+    """Collect up to EVENT_BATCH_SIZE events within EVENT_BATCH_WINDOW and rate them together"""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _event_batch_queue.get()]
+        deadline = loop.time() + EVENT_BATCH_WINDOW
+        while len(batch) < EVENT_BATCH_SIZE:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(_event_batch_queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        
+        # Rate this batch while the next one is being collected
+        run_in_background(rate_event_batch(batch))
+
+async def rate_event_batch(batch: list) -> None:
+    """Rate a batch of events in one model call and resolve each event's future"""
+    events_text = "\n\n".join(
+        f"Event {i}:\nContext:\n{context}\nEvent: {event_type} - {event_data}"
+        for i, (context, event_type, event_data, _) in enumerate(batch, 1)
+    )
+    messages = [
+        ASUKA_MESSAGE,
+        GAME_EVENT_RUBRIC_MESSAGE,
+        {"role": "user", "content": events_text}
+    ]
     
-def handle_ai_chat_tts(ai_response: str, player: str = "Player"):
-    if not ai_response or ai_response.lower() == "no response":
-        return 
+    ratings = []
+    try:
+        resp = await rating_client.chat.completions.create(
+            messages=messages,
+            response_format={"type": "json_object"},
+            **{**GAME_EVENT_KWARGS, "max_tokens": GAME_EVENT_KWARGS["max_tokens"] * len(batch)}
+        )
+        payload = orjson.loads(resp.choices[0].message.content)
+        ratings = payload.get("ratings") if isinstance(payload, dict) else None
+        # A batch of one sometimes comes back as a bare verdict object
+        if ratings is None and len(batch) == 1 and isinstance(payload, dict) and "rating" in payload:
+            ratings = [payload]
+        if not isinstance(ratings, list):
+            raise ValueError(f"expected a ratings list, got {type(ratings).__name__}")
+    except Exception as e:
+        ratings = []
+        for *_, future in batch:
+            if not future.done():
+                future.set_exception(e)
+    finally:
+        # Never leave a caller waiting; missing or malformed entries rate as {}
+        for i, (*_, future) in enumerate(batch):
+            if not future.done():
+                verdict = ratings[i] if i < len(ratings) and isinstance(ratings[i], dict) else {}
+                future.set_result(verdict)
     
-    def speak_in_background():
+# Single TTS worker fed by a bounded queue; lines are spoken one at a time
+tts_queue: "queue.Queue[tuple]" = queue.Queue(maxsize=8)
+
+def _tts_worker():
+    while True:
+        text, player = tts_queue.get()
         try:
             audio_stream = elevenlabs.text_to_speech.convert(
-                text=ai_response,
+                text=text,
                 voice_id="Xb7hH8MSUJpSbSDYk0k2",
                 model_id="eleven_turbo_v2"
             )
             play(audio_stream)  # Starts playing immediately
         except Exception as e:
-            print(f"TTS error: {e}")
+            logger.error("TTS error: %s", e)
+        finally:
+            tts_queue.task_done()
+
+threading.Thread(target=_tts_worker, name="tts-worker", daemon=True).start()
+
+def handle_ai_chat_tts(ai_response: str, player: str = "Player"):
+    if not ai_response or ai_response.lower() == "no response":
+        return 
     
-    tts_thread = threading.Thread(target=speak_in_background, daemon=True)
-    tts_thread.start()
+    try:
+        tts_queue.put_nowait((ai_response, player))
+    except queue.Full:
+        pass  # speech is already backed up; drop this line
+
+# Cap on /event requests being handled at once; the rest queue up to ADMISSION_TIMEOUT
+MAX_INFLIGHT_EVENTS = 32
+ADMISSION_TIMEOUT = 2.0  # seconds
+_event_slots: Optional[asyncio.Semaphore] = None  # created by lifespan
 
 @app.post("/event")
-async def ingest(request: Request):
+async def ingest(request: Request, bg: BackgroundTasks):
     """Main event handler endpoint"""
-    data = await request.json()
-    print(">>> /event RECEIVED:", data, flush=True)
+    data = orjson.loads(await request.body())
+    logger.debug(">>> /event RECEIVED: %s", data)
+    
+    # Admission control: wait briefly for a slot, otherwise shed the request
+    try:
+        await asyncio.wait_for(_event_slots.acquire(), ADMISSION_TIMEOUT)
+    except asyncio.TimeoutError:
+        return ORJSONResponse({"ok": False, "error": "server busy"}, status_code=503)
     
+    # Chat clients that accept server-sent events get the reply token by token
+    wants_stream = "text/event-stream" in request.headers.get("accept", "")
+    stream = None
     reply = ""
     
-    if data.get("type") == "player_chat":
-        reply = handle_chat(data)
-    else:
-        # Handle other game events (block break, crafting, etc.)
-        reply = handle_game_event(data)
+    try:
+        if data.get("type") == "player_chat" and wants_stream:
+            stream = await open_chat_stream(data)
+        elif data.get("type") == "player_chat":
+            reply = await handle_chat(data)
+        else:
+            # Handle other game events (block break, crafting, etc.)
+            reply = await handle_game_event(data)
+    finally:
+        _event_slots.release()
     
-    # Check if we should consolidate memories
+    # Check if we should consolidate memories (after the response is sent); resetting
+    # the counter here coalesces triggers that arrive while one is in flight
     if memory_system.should_consolidate():
-        memory_system.consolidate_memories_with_ai()
+        memory_system.reset_consolidation_counter()
+        bg.add_task(consolidate_in_background)
+    
+    if stream is not None:
+        return StreamingResponse(stream, media_type="text/event-stream")
     
     response = {"ok": True}
     if reply and reply.strip():
@@ -215,56 +546,109 @@ async def ingest(request: Request):
 
     return response
 
+# Versions restart at zero with the process, so tag ETags with the start time too
+ETAG_EPOCH = format(time.time_ns(), "x")
+
+# Encoded response bodies, reused until memory changes
+ENCODED_CACHE_SIZE = 64
+_encoded_responses: OrderedDict = OrderedDict()  # key -> (memory version, JSON bytes)
+
+def encoded_body(key: tuple, version: int, build: Callable[[], Any]) -> bytes:
+    """JSON bytes for an endpoint's data, encoded at most once per memory version"""
+    cached = _encoded_responses.get(key)
+    if cached is not None and cached[0] == version:
+        _encoded_responses.move_to_end(key)
+        return cached[1]
+    body = orjson.dumps(build())
+    _encoded_responses[key] = (version, body)
+    _encoded_responses.move_to_end(key)
+    if len(_encoded_responses) > ENCODED_CACHE_SIZE:
+        _encoded_responses.popitem(last=False)
+    return body
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against our ETag (RFC 9110)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    def opaque(tag: str) -> str:
+        tag = tag.strip()
+        return tag[2:] if tag.startswith("W/") else tag
+    return any(opaque(tag) == opaque(etag) for tag in if_none_match.split(","))
+
+def versioned_response(request: Request, key: tuple, build: Callable[[], Any]) -> Response:
+    """
+    Serve memory-derived data with an ETag tied to the memory version
+    
+    Pollers that send back the current ETag get an empty 304; everyone else
+    gets the body encoded once for this version, under the given cache key.
+    """
+    version = memory_system.version
+    etag = f'W/"{ETAG_EPOCH}-{version}"'
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(
+        content=encoded_body(key, version, build),
+        media_type="application/json",
+        headers={"ETag": etag}
+    )
+
 # Memory management endpoints
 @app.get("/memory/status")
-async def get_memory_status():
+async def get_memory_status(request: Request):
     """Get detailed memory system status"""
-    return memory_system.get_memory_stats()
+    return versioned_response(request, ("status",), memory_system.get_memory_stats)
 
 @app.get("/memory/facts")
-async def get_long_term_facts():
+async def get_long_term_facts(request: Request):
     """View current long-term facts"""
-    return memory_system.memory["long_term"]
+    return versioned_response(request, ("facts",), lambda: memory_system.memory["long_term"])
 
 @app.get("/memory/recent/{player}")
-async def get_recent_events(player: str, count: int = 10):
-    """Get recent events for a specific player"""
-    return memory_system.get_recent_events(count, player)
+async def get_recent_events(request: Request, player: str, count: int = Query(10, ge=0)):
+    """Get recent events for a specific player (count=0 for all of them)"""
+    return versioned_response(
+        request, ("recent", player, count), lambda: memory_system.get_recent_events(count, player)
+    )
 
 @app.post("/memory/consolidate")
 async def force_consolidation():
     """Manually trigger memory consolidation"""
-    success = memory_system.consolidate_memories_with_ai()
+    async with _consolidation_lock:
+        success = await asyncio.to_thread(memory_system.consolidate_memories_with_ai)
     return {"status": "success" if success else "failed"}
 
 @app.delete("/memory/clear")
 async def clear_memory(keep_long_term: bool = True):
     """Clear memory data"""
-    memory_system.clear_memory(keep_long_term)
+    await asyncio.to_thread(memory_system.clear_memory, keep_long_term)
     return {"status": "Memory cleared", "long_term_preserved": keep_long_term}
 
 @app.delete("/memory/clearall")
 # completely wipes ai both short and long term memory
 async def clear_memory(keep_long_term: bool = False):
     """Clear memory data"""
-    memory_system.clear_memory(keep_long_term)
+    await asyncio.to_thread(memory_system.clear_memory, keep_long_term)
     return {"status": "Memory cleared", "long_term_preserved": keep_long_term}
 
 @app.get("/memory/export/{filename}")
 async def export_memory(filename: str):
     """Export memory to file"""
-    success = memory_system.export_memory(filename)
+    success = await asyncio.to_thread(memory_system.export_memory, filename)
     return {"status": "success" if success else "failed"}
 
 # Health check with memory info
 @app.get("/health")
-async def health_check():
+async def health_check(request: Request):
     """Health check endpoint with memory statistics"""
-    stats = memory_system.get_memory_stats()
-    return {
-        "status": "healthy",
-        "server": "FastAPI Minecraft AI Companion",
-        "memory_system": "active",
-        "events_processed": stats["total_events_processed"],
-        "consolidations_run": stats["consolidations_run"]
-    }
\ No newline at end of file
+    def build():
+        stats = memory_system.get_memory_stats()
+        return {
+            "status": "healthy",
+            "server": "FastAPI Minecraft AI Companion",
+            "memory_system": "active",
+            "events_processed": stats["total_events_processed"],
+            "consolidations_run": stats["consolidations_run"]
+        }
+    return versioned_response(request, ("health",), build)
\ No newline at end of file